@@ -4,14 +4,31 @@ import re
 import json
 import hashlib
 import base64
+import binascii
 import time
 import datetime
 import os
+import ssl
 import sys
-from bs4 import BeautifulSoup
+import threading
+import lxml.etree
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Dict, List, Optional, Union, Any, Tuple
 import argparse
+from urllib.parse import urlsplit
+
+# slots=True dataclasses below need Python 3.10+; macOS still ships 3.9 as python3
+if sys.version_info < (3, 10):
+    sys.exit(f"PCSI requires Python 3.10 or newer (running {sys.version.split()[0]})")
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib parser gives the same result
+    _json_loads = json.loads
 
 # Set up logging and error handling for Mac
 import logging
@@ -21,146 +38,304 @@ logging.basicConfig(
 )
 logger = logging.getLogger('pcsi')
 
+# Bound once so the hashing hot path skips module attribute lookups
+_sha256 = hashlib.sha256
+_b64 = binascii.b2a_base64
+
+# Integer clock read; `_now() // 1_000_000_000` gives Unix seconds without a float
+_now = time.time_ns
+
+def _log_hash_backend():
+    """Log which OpenSSL build backs SHA-256 and whether the CPU has SHA-NI.
+
+    OpenSSL picks its SHA-256 implementation at runtime: SHA-NI when CPUID
+    reports it, otherwise the AVX2/SSSE3 assembly paths.
+    """
+    logger.debug(f"OpenSSL: {ssl.OPENSSL_VERSION}")
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            sha_ni = ' sha_ni' in f.read()
+    except OSError:
+        # No /proc on macOS; OpenSSL still detects the CPU features itself
+        return
+    logger.debug(f"SHA-NI available: {sha_ni}")
+
 # PCSI Core Classes
 class SExpression:
     @staticmethod
-    def create_string(s: str) -> str:
-        """Create a canonical S-expression string with length prefix."""
+    def write_string(out: bytearray, s: str):
+        """Append a length-prefixed string to a UTF-8 buffer."""
         if s is None or s == "":
-            return ""
-        return f"{len(s)}:{s}"
+            return
+        # Encode once; the prefix is the byte length, not the code-point count
+        encoded = s.encode('utf-8')
+        out += b"%d:" % len(encoded)
+        out += encoded
     
     @staticmethod
-    def create_object(name: str, content: str = "") -> str:
-        """Create an S-expression object."""
-        if not content:
-            return ""
-        name_expr = SExpression.create_string(name)
-        return f"({name_expr}{content})"
+    def write_field(out: bytearray, name: str, value: str):
+        """Append an object holding one string; nothing is written for an empty value."""
+        if value is None or value == "":
+            return
+        out += b"("
+        SExpression.write_string(out, name)
+        SExpression.write_string(out, value)
+        out += b")"
     
     @staticmethod
-    def hash_sexp(sexp: str) -> str:
-        """Create a base64-encoded SHA-256 hash of an S-expression."""
-        hash_obj = hashlib.sha256(sexp.encode('utf-8'))
-        return base64.b64encode(hash_obj.digest()).decode('utf-8')
+    def open_object(out: bytearray, name: str) -> Tuple[int, int]:
+        """Write the opening of an object and return a mark for `close_object`."""
+        start = len(out)
+        out += b"("
+        SExpression.write_string(out, name)
+        return start, len(out)
+    
+    @staticmethod
+    def close_object(out: bytearray, mark: Tuple[int, int]):
+        """Close an object, dropping it entirely if nothing was written inside."""
+        start, content_start = mark
+        if len(out) == content_start:
+            del out[start:]
+        else:
+            out += b")"
+    
+    @staticmethod
+    def hash_bytes(sexp: Union[bytes, bytearray]) -> str:
+        """Create a base64-encoded SHA-256 hash of a UTF-8 encoded S-expression."""
+        # Content hashes are identifiers, not security primitives
+        digest = _sha256(sexp, usedforsecurity=False).digest()
+        return _b64(digest, newline=False).decode('ascii')
 
-@dataclass
-class ContentObject:
-    """Base class for structured content objects."""
-    type: str
+class SExpressionSerializable:
+    """Mixin for objects serialized to canonical S-expressions."""
+    __slots__ = ()
+    
+    def to_sexp_bytes(self, out: bytearray):
+        """Append the canonical S-expression, UTF-8 encoded, to `out`."""
+        raise NotImplementedError
     
     def to_sexp(self) -> str:
         """Convert object to canonical S-expression format."""
-        raise NotImplementedError
+        out = bytearray()
+        self.to_sexp_bytes(out)
+        return out.decode('utf-8')
+
+@dataclass(slots=True)
+class ContentObject(SExpressionSerializable):
+    """Base class for structured content objects."""
+    type: str
+    _hash_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def hash(self) -> str:
-        """Generate a hash of the S-expression representation."""
-        return SExpression.hash_sexp(self.to_sexp())
+        """Generate a hash of the S-expression representation (computed once per object)."""
+        if self._hash_cache is None:
+            out = bytearray()
+            self.to_sexp_bytes(out)
+            self._hash_cache = SExpression.hash_bytes(out)
+        return self._hash_cache
+    
+    def serialize(self) -> Tuple[bytes, str]:
+        """Serialize once and return the S-expression bytes together with their hash.
+        
+        The hash is always recomputed from these bytes so the pair agrees even if
+        the object changed since an earlier `hash()`; the memoized hash is refreshed.
+        """
+        out = bytearray()
+        self.to_sexp_bytes(out)
+        self._hash_cache = SExpression.hash_bytes(out)
+        return bytes(out), self._hash_cache
 
-@dataclass
-class Link:
-    url: str
+class BodyElement(SExpressionSerializable):
+    """Mixin for article body elements with a memoized S-expression.
+    
+    Elements render themselves, so the serializers and `save_article_content`
+    dispatch through a method call instead of chains of isinstance checks.
+    Subclasses declare a `_sexp_cache` slot holding the memoized bytes.
+    """
+    __slots__ = ()
+    
+    @property
+    def sexp_bytes(self) -> bytes:
+        """Memoized `to_sexp_bytes()` output."""
+        cached = self._sexp_cache
+        if cached is None:
+            out = bytearray()
+            self.to_sexp_bytes(out)
+            cached = bytes(out)
+            # object.__setattr__ also works on the frozen element classes
+            object.__setattr__(self, '_sexp_cache', cached)
+        return cached
+    
+    def to_sexp_fragment(self, out: bytearray):
+        """Append this element's memoized S-expression to `out`."""
+        out += self.sexp_bytes
+    
+    def to_text(self, out: List[str]):
+        """Append the human-readable rendering of this element to `out`."""
+        raise NotImplementedError
+
+class TextRun(str):
+    """Plain text inside a paragraph."""
+    __slots__ = ()
     
-    def to_sexp(self) -> str:
-        url_expr = SExpression.create_object("url", SExpression.create_string(self.url))
-        return SExpression.create_object("link", url_expr)
+    def to_sexp_fragment(self, out: bytearray):
+        SExpression.write_string(out, self)
+    
+    def to_text(self, out: List[str]):
+        out.append(self)
 
-@dataclass
-class Paragraph:
-    content: List[Union[str, Link]] = field(default_factory=list)
+@dataclass(frozen=True, slots=True)
+class Link(BodyElement):
+    url: str
+    _sexp_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_sexp(self) -> str:
+    def to_sexp_bytes(self, out: bytearray):
+        mark = SExpression.open_object(out, "link")
+        SExpression.write_field(out, "url", self.url)
+        SExpression.close_object(out, mark)
+    
+    def to_text(self, out: List[str]):
+        out.append(f"[LINK: {self.url}]")
+
+@dataclass(slots=True)
+class Paragraph(BodyElement):
+    """A run of text and links; modify `content` only through `append`."""
+    content: List[Union[TextRun, Link]] = field(default_factory=list)
+    _sexp_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.content[:] = [
+            TextRun(item) if isinstance(item, str) and not isinstance(item, TextRun) else item
+            for item in self.content
+        ]
+    
+    def append(self, item: Union[str, Link]):
+        """Add text or a link, invalidating the memoized S-expression."""
+        if isinstance(item, str) and not isinstance(item, TextRun):
+            item = TextRun(item)
+        self.content.append(item)
+        self._sexp_cache = None
+    
+    def to_sexp_bytes(self, out: bytearray):
         """Convert paragraph and its content to S-expression format."""
-        content_expr = ""
+        mark = SExpression.open_object(out, "paragraph")
         for item in self.content:
-            if isinstance(item, str):
-                content_expr += SExpression.create_string(item)
-            else:  # Link
-                content_expr += item.to_sexp()
-        return SExpression.create_object("paragraph", content_expr)
+            item.to_sexp_fragment(out)
+        SExpression.close_object(out, mark)
+    
+    def to_text(self, out: List[str]):
+        for item in self.content:
+            item.to_text(out)
+        out.append("\n\n")
 
-@dataclass
-class Subheading:
+@dataclass(frozen=True, slots=True)
+class Subheading(BodyElement):
     text: str
+    _sexp_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_sexp(self) -> str:
-        return SExpression.create_object("subheading", SExpression.create_string(self.text))
+    def to_sexp_bytes(self, out: bytearray):
+        SExpression.write_field(out, "subheading", self.text)
+    
+    def to_text(self, out: List[str]):
+        out.append(f"\n## {self.text}\n\n")
 
-@dataclass
-class Image:
+@dataclass(frozen=True, slots=True)
+class Image(BodyElement):
     url: str
     caption: str = ""
-    
-    def to_sexp(self) -> str:
-        url_expr = SExpression.create_object("url", SExpression.create_string(self.url))
-        caption_expr = SExpression.create_object("caption", SExpression.create_string(self.caption))
-        return SExpression.create_object("image", url_expr + caption_expr)
+    _sexp_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_sexp_bytes(self, out: bytearray):
+        mark = SExpression.open_object(out, "image")
+        SExpression.write_field(out, "url", self.url)
+        SExpression.write_field(out, "caption", self.caption)
+        SExpression.close_object(out, mark)
+    
+    def to_text(self, out: List[str]):
+        out.append(f"[IMAGE: {self.url}]\n")
+        if self.caption:
+            out.append(f"Caption: {self.caption}\n\n")
 
-@dataclass
-class ArticleBody:
+@dataclass(slots=True)
+class ArticleBody(SExpressionSerializable):
     elements: List[Union[Paragraph, Subheading, Image]] = field(default_factory=list)
     
-    def to_sexp(self) -> str:
-        content_expr = ""
+    def to_sexp_bytes(self, out: bytearray):
+        mark = SExpression.open_object(out, "body")
         for element in self.elements:
-            content_expr += element.to_sexp()
-        return SExpression.create_object("body", content_expr)
+            element.to_sexp_fragment(out)
+        SExpression.close_object(out, mark)
 
-@dataclass
+@dataclass(slots=True)
 class Article(ContentObject):
+    type: str = field(default="article", init=False)
     headline: str
     date: int  # Unix timestamp
     author: str
     body: ArticleBody
     
-    def __init__(self, headline: str, date: int, author: str, body: ArticleBody):
-        super().__init__(type="article")
-        self.headline = headline
-        self.date = date
-        self.author = author
-        self.body = body
-    
-    def to_sexp(self) -> str:
-        headline_expr = SExpression.create_object("headline", SExpression.create_string(self.headline))
-        date_expr = SExpression.create_object("date", SExpression.create_string(str(self.date)))
-        author_expr = SExpression.create_object("author", SExpression.create_string(self.author))
-        body_expr = self.body.to_sexp()
-        
-        content = headline_expr + date_expr + author_expr + body_expr
-        return SExpression.create_object("article", content)
+    def to_sexp_bytes(self, out: bytearray):
+        date = str(self.date)
+        out += b"(7:article"
+        SExpression.write_field(out, "headline", self.headline)
+        out += b"(4:date%d:%s)" % (len(date), date.encode('ascii'))
+        SExpression.write_field(out, "author", self.author)
+        self.body.to_sexp_bytes(out)
+        out += b")"
+
+@dataclass(frozen=True, slots=True)
+class ProcessedArticle:
+    """An extracted article with the S-expression and hash computed for it."""
+    article: Article
+    sexp: bytes  # UTF-8 encoded canonical S-expression
+    object_hash: str
 
-@dataclass
-class PCSIRecord:
+@dataclass(slots=True)
+class PCSIRecord(SExpressionSerializable):
     """Base class for PCSI records."""
     source: str
     timestamp: int
+    _sexp: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_sexp(self) -> str:
-        """Convert record to canonical S-expression format."""
-        raise NotImplementedError
+    def finalize(self) -> bytes:
+        """Serialize the completed record once and keep the bytes for export.
+        
+        Records must not be modified after this is called.
+        """
+        out = bytearray()
+        self.to_sexp_bytes(out)
+        self._sexp = bytes(out)
+        return self._sexp
+    
+    def _write_header(self, out: bytearray):
+        """Append the source and timestamp fields shared by every record."""
+        timestamp = str(self.timestamp)
+        out += b"(6:source|%s|)" % self.source.encode('utf-8')
+        out += b"(9:timestamp%d:%s)" % (len(timestamp), timestamp.encode('ascii'))
 
-@dataclass
+@dataclass(slots=True)
 class Rule(PCSIRecord):
     pattern: str
     script_hash: str
     object_type: str
     script: Optional[str] = None
-    
-    def to_sexp(self) -> str:
-        source_expr = SExpression.create_object("source", f"|{self.source}|")
-        timestamp_expr = SExpression.create_object("timestamp", SExpression.create_string(str(self.timestamp)))
-        pattern_expr = SExpression.create_object("pattern", SExpression.create_string(self.pattern))
-        script_hash_expr = SExpression.create_object("script-hash", f"|{self.script_hash}|")
-        object_type_expr = SExpression.create_object("object-type", SExpression.create_string(self.object_type))
-        
-        content = source_expr + timestamp_expr + pattern_expr + script_hash_expr + object_type_expr
+    _compiled: re.Pattern = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Compiled once so URL matching skips the re module's pattern cache
+        self._compiled = re.compile(self.pattern)
+    
+    def to_sexp_bytes(self, out: bytearray):
+        out += b"(4:rule"
+        self._write_header(out)
+        SExpression.write_field(out, "pattern", self.pattern)
+        out += b"(11:script-hash|%s|)" % self.script_hash.encode('utf-8')
+        SExpression.write_field(out, "object-type", self.object_type)
         if self.script:
-            script_expr = SExpression.create_object("script", SExpression.create_string(self.script))
-            content += script_expr
-            
-        return SExpression.create_object("rule", content)
+            SExpression.write_field(out, "script", self.script)
+        out += b")"
 
-@dataclass
+@dataclass(slots=True)
 class Inference(PCSIRecord):
     url: str
     script_hash: str
@@ -170,56 +345,115 @@ class Inference(PCSIRecord):
     script: Optional[str] = None
     object: Optional[str] = None
     
-    def to_sexp(self) -> str:
-        source_expr = SExpression.create_object("source", f"|{self.source}|")
-        timestamp_expr = SExpression.create_object("timestamp", SExpression.create_string(str(self.timestamp)))
-        url_expr = SExpression.create_object("url", SExpression.create_string(self.url))
-        script_hash_expr = SExpression.create_object("script-hash", f"|{self.script_hash}|")
-        
-        content = source_expr + timestamp_expr + url_expr + script_hash_expr
+    def to_sexp_bytes(self, out: bytearray):
+        out += b"(9:inference"
+        self._write_header(out)
+        SExpression.write_field(out, "url", self.url)
+        out += b"(11:script-hash|%s|)" % self.script_hash.encode('utf-8')
         
         if self.error:
-            error_expr = SExpression.create_object("error", SExpression.create_string(self.error))
-            content += error_expr
+            SExpression.write_field(out, "error", self.error)
         else:
-            object_type_expr = SExpression.create_object("object-type", SExpression.create_string(self.object_type))
-            object_hash_expr = SExpression.create_object("object-hash", f"|{self.object_hash}|")
-            content += object_type_expr + object_hash_expr
+            SExpression.write_field(out, "object-type", self.object_type)
+            out += b"(11:object-hash|%s|)" % str(self.object_hash).encode('utf-8')
             
         if self.script:
-            script_expr = SExpression.create_object("script", SExpression.create_string(self.script))
-            content += script_expr
+            SExpression.write_field(out, "script", self.script)
             
         if self.object:
-            object_expr = SExpression.create_object("object", self.object)
-            content += object_expr
+            out += b"(6:object%s)" % self.object.encode('utf-8')
             
-        return SExpression.create_object("inference", content)
+        out += b")"
 
-@dataclass
+@dataclass(slots=True)
 class Perception(PCSIRecord):
     url: str
     object_type: str
     object_hash: str
     valid: bool
     
-    def to_sexp(self) -> str:
-        source_expr = SExpression.create_object("source", f"|{self.source}|")
-        timestamp_expr = SExpression.create_object("timestamp", SExpression.create_string(str(self.timestamp)))
-        url_expr = SExpression.create_object("url", SExpression.create_string(self.url))
-        object_type_expr = SExpression.create_object("object-type", SExpression.create_string(self.object_type))
-        object_hash_expr = SExpression.create_object("object-hash", f"|{self.object_hash}|")
-        valid_expr = SExpression.create_object("valid", SExpression.create_string("1" if self.valid else "0"))
-        
-        content = source_expr + timestamp_expr + url_expr + object_type_expr + object_hash_expr + valid_expr
-        return SExpression.create_object("perception", content)
+    def to_sexp_bytes(self, out: bytearray):
+        out += b"(10:perception"
+        self._write_header(out)
+        SExpression.write_field(out, "url", self.url)
+        SExpression.write_field(out, "object-type", self.object_type)
+        out += b"(11:object-hash|%s|)" % str(self.object_hash).encode('utf-8')
+        out += b"(5:valid1:1)" if self.valid else b"(5:valid1:0)"
+        out += b")"
 
 # HTML Processing Script - Equivalent to the Hex script in the paper
 class BBCArticleExtractor:
     """Extract structured content from BBC news articles."""
     
-    def __init__(self):
+    # Compiled once; lxml serializes concurrent evaluations of an XPath object
+    _xp_headline = lxml.etree.XPath('(//h1)[1]')
+    # Plain str results: orjson rejects lxml's str subclass "smart strings"
+    _xp_jsonld = lxml.etree.XPath('(//script[@type="application/ld+json"])[1]/text()', smart_strings=False)
+    # Main content selector varies across BBC articles, tried in this order
+    _xp_main_content = (
+        lxml.etree.XPath('(//main[@id="main-content"]//article)[1]'),
+        lxml.etree.XPath('(//article)[1]'),
+        lxml.etree.XPath('(//main)[1]'),
+    )
+    
+    def __init__(self, pool_size: int = 32, cache_dir: Optional[str] = None):
+        """Set up the HTTP session.
+        
+        With `cache_dir`, fetched HTML is stored there keyed by the SHA-256 of
+        the URL and reused on later runs; meant for development, not production.
+        """
+        self.cache_dir = cache_dir
         self.user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+        # One session keeps connections to bbc.com alive across articles, saving
+        # the TCP and TLS handshakes; the pool is sized for concurrent workers
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = self.user_agent
+        # Ask for compressed bodies; Brotli (smaller than gzip, served by BBC) only
+        # when urllib3 found a brotli decoder, otherwise the body would be unreadable
+        if 'br' in requests.utils.DEFAULT_ACCEPT_ENCODING:
+            self._session.headers['Accept-Encoding'] = 'br, gzip'
+        else:
+            self._session.headers['Accept-Encoding'] = 'gzip'
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+    def close(self):
+        """Close pooled HTTP connections."""
+        self._session.close()
+        
+    def _fetch(self, url: str) -> bytes:
+        """Return the raw HTML for a URL, from the cache when enabled."""
+        cache_path = None
+        if self.cache_dir:
+            key = _sha256(url.encode('utf-8'), usedforsecurity=False).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"{key}.html")
+            try:
+                with open(cache_path, 'rb') as f:
+                    logger.info(f"Using cached HTML for {url}")
+                    return f.read()
+            except FileNotFoundError:
+                pass
+        
+        try:
+            response = self._session.get(url, timeout=10)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch URL: {url} - {str(e)}")
+            raise ValueError(f"Failed to fetch URL: {str(e)}")
+        content = response.content
+        
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write then rename so concurrent workers never read a partial file
+                tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Failed to cache HTML for {url}: {str(e)}")
+        return content
         
     def _parse_date(self, date_str: str) -> int:
         """Convert date string to Unix timestamp."""
@@ -228,25 +462,27 @@ class BBCArticleExtractor:
             return int(dt.timestamp())
         except (ValueError, TypeError):
             logger.warning(f"Failed to parse date string: {date_str}")
-            return int(time.time())  # Fallback to current time
+            return _now() // 1_000_000_000  # Fallback to current time
     
     def _extract_text_with_links(self, element) -> Paragraph:
-        """Extract text and links from an element."""
+        """Extract text and links from an element in one pass over its children.
+        
+        Returns an empty paragraph when the element has no visible text.
+        """
         paragraph = Paragraph()
+        has_text = False
         
-        # If the element has no children or is just text, add it as a string
-        if not element.contents:
-            if element.string and element.string.strip():
-                paragraph.content.append(element.string.strip())
-            return paragraph
-            
-        current_text = ""
-        for child in element.contents:
-            if child.name == 'a' and child.get('href'):
+        # Text fragments since the last link, joined once when flushed
+        text_parts = [element.text or ""]
+        for child in element:
+            tag = child.tag
+            if tag == 'a' and child.get('href'):
                 # Add accumulated text before the link
+                current_text = "".join(text_parts)
                 if current_text:
-                    paragraph.content.append(current_text)
-                    current_text = ""
+                    has_text = has_text or not current_text.isspace()
+                    paragraph.append(current_text)
+                    text_parts = []
                 
                 # Add the link
                 url = child.get('href')
@@ -256,29 +492,33 @@ class BBCArticleExtractor:
                     else:
                         url = f"https://www.bbc.com/{url}"
                 
-                paragraph.content.append(Link(url))
+                paragraph.append(Link(url))
                 
                 # Add link text
-                if child.text:
-                    current_text += child.text
-            elif isinstance(child, str):
-                current_text += child
-            else:
-                # Recursive extraction for nested elements
-                if child.name != 'br':  # Skip line breaks
-                    if child.text:
-                        current_text += child.text
+                text_parts.append(child.text_content())
+            elif isinstance(tag, str) and tag != 'br':  # Skip comments and line breaks
+                # Nested elements are flattened to their text
+                text_parts.append(child.text_content())
+            
+            # Text following the child belongs to this element
+            if child.tail:
+                text_parts.append(child.tail)
         
         # Add any remaining text
+        current_text = "".join(text_parts)
         if current_text:
-            paragraph.content.append(current_text)
-            
+            has_text = has_text or not current_text.isspace()
+            paragraph.append(current_text)
+        
+        if not has_text:
+            # Elements without visible text are dropped, even if they hold links
+            return Paragraph()
         return paragraph
     
     def _extract_image(self, figure_element) -> Optional[Image]:
         """Extract image URL and caption from a figure element."""
-        img_element = figure_element.find('img')
-        if not img_element:
+        img_element = figure_element.find('.//img')
+        if img_element is None:
             return None
             
         url = img_element.get('src', '')
@@ -290,42 +530,40 @@ class BBCArticleExtractor:
             return None
             
         caption = ""
-        figcaption = figure_element.find('figcaption')
-        if figcaption:
-            caption = figcaption.text.strip()
+        figcaption = figure_element.find('.//figcaption')
+        if figcaption is not None:
+            caption = figcaption.text_content().strip()
             
         return Image(url=url, caption=caption)
     
     def extract(self, url: str) -> Article:
         """Extract article content from BBC URL."""
         logger.info(f"Extracting content from {url}")
-        headers = {'User-Agent': self.user_agent}
+        content = self._fetch(url)
         
+        # lxml (libxml2) parses the raw bytes and sniffs the encoding itself
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch URL: {url} - {str(e)}")
-            raise ValueError(f"Failed to fetch URL: {str(e)}")
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
+            tree = lxml.html.fromstring(content)
+        except lxml.etree.ParserError as e:
+            logger.error(f"Failed to parse HTML: {str(e)}")
+            raise ValueError(f"Failed to parse HTML: {str(e)}")
         
         # Extract headline
-        headline_elem = soup.find('h1')
-        if not headline_elem:
+        headline_elems = self._xp_headline(tree)
+        if not headline_elems:
             logger.error("Missing headline element")
             raise ValueError("Missing headline element")
-        headline = headline_elem.text.strip()
+        headline = headline_elems[0].text_content().strip()
         logger.info(f"Found headline: {headline}")
         
         # Extract date and author from JSON-LD
-        date = int(time.time())  # Default to current time
+        date = _now() // 1_000_000_000  # Default to current time
         author = "BBC News"  # Default author
         
-        script_element = soup.find('script', {'type': 'application/ld+json'})
-        if script_element:
+        script_text = self._xp_jsonld(tree)
+        if script_text:
             try:
-                json_data = json.loads(script_element.string)
+                json_data = _json_loads(script_text[0])
                 if 'datePublished' in json_data:
                     date = self._parse_date(json_data['datePublished'])
                 
@@ -342,24 +580,30 @@ class BBCArticleExtractor:
         # Extract body content
         body = ArticleBody()
         
-        # Main content selector varies across BBC articles, try different patterns
-        main_content = soup.select_one('main#main-content article') or soup.select_one('article') or soup.select_one('main')
+        main_content = None
+        for xp_main in self._xp_main_content:
+            found = xp_main(tree)
+            if found:
+                main_content = found[0]
+                break
         
-        if not main_content:
+        if main_content is None:
             logger.error("Could not locate main content")
             raise ValueError("Could not locate main content")
             
         # Process paragraphs, subheadings, and images
-        for element in main_content.find_all(['p', 'h2', 'figure']):
-            if element.name == 'p' and element.text.strip():
+        for element in main_content.iter('p', 'h2', 'figure'):
+            if element.tag == 'p':
                 paragraph = self._extract_text_with_links(element)
                 if paragraph.content:
                     body.elements.append(paragraph)
                     
-            elif element.name == 'h2' and element.text.strip():
-                body.elements.append(Subheading(element.text.strip()))
+            elif element.tag == 'h2':
+                text = element.text_content().strip()
+                if text:
+                    body.elements.append(Subheading(text))
                 
-            elif element.name == 'figure':
+            elif element.tag == 'figure':
                 image = self._extract_image(element)
                 if image:
                     body.elements.append(image)
@@ -369,8 +613,14 @@ class BBCArticleExtractor:
 
 # PCSI System Implementation
 class PCSISystem:
-    def __init__(self, source_id: str = None):
-        """Initialize the PCSI system with a source identifier."""
+    # Characters that are unsafe in file names, mapped to '_' in a single pass
+    _FILENAME_SANITIZE = str.maketrans({c: '_' for c in ' /:?*<>|"\\\t\n'})
+    
+    def __init__(self, source_id: str = None, cache_dir: str = None):
+        """Initialize the PCSI system with a source identifier.
+        
+        `cache_dir` enables the extractors' on-disk HTML cache.
+        """
         if source_id:
             self.source_id = source_id
         else:
@@ -380,56 +630,99 @@ class PCSISystem:
         self.rules = []
         self.inferences = []
         self.perceptions = []
+        # Rule index for find_matching_rule: rules registered for specific hosts,
+        # plus the ones that may match any host
+        self._rules_by_host: Dict[str, List[Rule]] = {}
+        self._host_agnostic_rules: List[Rule] = []
+        # Guards the record lists when URLs are processed from worker threads;
+        # re-entrant because rule lookup and creation happen under one hold
+        self._lock = threading.RLock()
         self.extractors = {
-            'bbc_article': BBCArticleExtractor()
+            'bbc_article': BBCArticleExtractor(cache_dir=cache_dir)
         }
         logger.info(f"PCSI System initialized with source ID: {self.source_id[:8]}...")
     
-    def add_rule(self, pattern: str, script_hash: str, object_type: str, script: str = None) -> Rule:
-        """Add a rule to the system."""
+    def close(self):
+        """Release resources held by the extractors."""
+        for extractor in self.extractors.values():
+            extractor.close()
+    
+    def add_rule(self, pattern: str, script_hash: str, object_type: str, script: str = None,
+                 timestamp: int = None, hosts: Tuple[str, ...] = ()) -> Rule:
+        """Add a rule to the system.
+        
+        Bulk importers can pass one `timestamp` for the whole batch instead of
+        reading the clock per rule. `hosts` lists every host the pattern can
+        match, so lookups for other hosts skip it; without it the rule is tried
+        for every URL.
+        """
         rule = Rule(
             source=self.source_id,
-            timestamp=int(time.time()),
+            timestamp=_now() // 1_000_000_000 if timestamp is None else timestamp,
             pattern=pattern,
             script_hash=script_hash,
             object_type=object_type,
             script=script
         )
-        self.rules.append(rule)
+        rule.finalize()
+        with self._lock:
+            self.rules.append(rule)
+            if hosts:
+                for host in hosts:
+                    self._rules_by_host.setdefault(host.lower(), []).append(rule)
+            else:
+                self._host_agnostic_rules.append(rule)
         logger.info(f"Added rule for pattern: {pattern}")
         return rule
     
     def find_matching_rule(self, url: str) -> Optional[Rule]:
-        """Find a rule matching the given URL."""
-        for rule in self.rules:
-            if re.match(rule.pattern, url):
+        """Find a rule matching the given URL.
+        
+        Rules registered for the URL's host are tried before host-agnostic ones.
+        """
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            host = None
+        for rule in chain(self._rules_by_host.get(host, ()), self._host_agnostic_rules):
+            if rule._compiled.match(url):
                 logger.info(f"Found matching rule for {url}")
                 return rule
         logger.info(f"No matching rule found for {url}")
         return None
     
-    def process_url(self, url: str) -> Tuple[Optional[ContentObject], Optional[Inference]]:
-        """Process a URL and generate a structured content object and inference record."""
-        rule = self.find_matching_rule(url)
-        if not rule:
-            # Updated pattern to match more BBC article URL formats
-            if 'bbc.com' in url and ('/news/' in url or '/sport/' in url):
-                # Create a default rule for BBC articles
-                extractor = self.extractors['bbc_article']
-                script_hash = "CY7Iwrrw5i7MyjV7Zqdwf2Tj0Hb3iCsJF4Sv6jcrUyw="  # Placeholder hash
-                rule = self.add_rule(
-                    pattern=r"https?://(www\.)?bbc\.com/.*",
-                    script_hash=script_hash,
-                    object_type="article"
-                )
-            else:
-                logger.warning(f"No rule available for URL: {url}")
-                return None, None
+    def process_url(self, url: str, record: bool = True) -> Tuple[Optional[ProcessedArticle], Optional[Inference]]:
+        """Process a URL and generate a structured content object and inference record.
+        
+        The article is serialized and hashed exactly once here; callers reuse
+        the returned bytes and hash for printing and perception records.
+        Concurrent callers pass `record=False` and hand the inferences to
+        `record_inference` in input order, so exports do not depend on which
+        worker finishes first.
+        """
+        # Look up and create under one lock so concurrent URLs share a single default rule
+        with self._lock:
+            rule = self.find_matching_rule(url)
+            if not rule:
+                # Updated pattern to match more BBC article URL formats
+                if 'bbc.com' in url and ('/news/' in url or '/sport/' in url):
+                    # Create a default rule for BBC articles
+                    extractor = self.extractors['bbc_article']
+                    script_hash = "CY7Iwrrw5i7MyjV7Zqdwf2Tj0Hb3iCsJF4Sv6jcrUyw="  # Placeholder hash
+                    rule = self.add_rule(
+                        pattern=r"https?://(www\.)?bbc\.com/.*",
+                        script_hash=script_hash,
+                        object_type="article",
+                        hosts=("bbc.com", "www.bbc.com")
+                    )
+                else:
+                    logger.warning(f"No rule available for URL: {url}")
+                    return None, None
         
         # Start creating an inference record
         inference = Inference(
             source=self.source_id,
-            timestamp=int(time.time()),
+            timestamp=_now() // 1_000_000_000,
             url=url,
             script_hash=rule.script_hash
         )
@@ -439,52 +732,65 @@ class PCSISystem:
             extractor = self.extractors['bbc_article']
             content_object = extractor.extract(url)
             
+            # Serialize and hash in one pass; this runs on the caller's worker
+            # thread (hashlib drops the GIL for large buffers)
+            sexp, object_hash = content_object.serialize()
+            
             # Complete the inference record
             inference.object_type = rule.object_type
-            inference.object_hash = content_object.hash()
+            inference.object_hash = object_hash
             
             # Store the inference
-            self.inferences.append(inference)
+            inference.finalize()
+            if record:
+                self.record_inference(inference)
             
-            return content_object, inference
+            return ProcessedArticle(content_object, sexp, object_hash), inference
                 
         except Exception as e:
             # Record the error in the inference
             logger.error(f"Error extracting content: {str(e)}")
             inference.error = str(e)
-            self.inferences.append(inference)
+            inference.finalize()
+            if record:
+                self.record_inference(inference)
         
         return None, inference
     
-    def add_perception(self, url: str, object_type: str, object_hash: str, valid: bool) -> Perception:
-        """Add a perception record about content validity."""
+    def record_inference(self, inference: Inference):
+        """Store a completed inference record for export."""
+        with self._lock:
+            self.inferences.append(inference)
+    
+    def add_perception(self, url: str, object_type: str, object_hash: str, valid: bool,
+                       timestamp: int = None) -> Perception:
+        """Add a perception record about content validity.
+        
+        Batch callers can pass one shared `timestamp` instead of reading the
+        clock per record.
+        """
         perception = Perception(
             source=self.source_id,
-            timestamp=int(time.time()),
+            timestamp=_now() // 1_000_000_000 if timestamp is None else timestamp,
             url=url,
             object_type=object_type,
             object_hash=object_hash,
             valid=valid
         )
-        self.perceptions.append(perception)
+        perception.finalize()
+        with self._lock:
+            self.perceptions.append(perception)
         logger.info(f"Added perception for {url}: valid={valid}")
         return perception
     
     def export_records(self, filename: str):
         """Export all records to a file."""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                # Export rules
-                for rule in self.rules:
-                    f.write(rule.to_sexp() + '\n')
-                
-                # Export inferences
-                for inference in self.inferences:
-                    f.write(inference.to_sexp() + '\n')
-                
-                # Export perceptions
-                for perception in self.perceptions:
-                    f.write(perception.to_sexp() + '\n')
+            # Rules, then inferences, then perceptions, each already serialized;
+            # the large buffer batches them into few write() calls
+            records = chain(self.rules, self.inferences, self.perceptions)
+            with open(filename, 'wb', buffering=1 << 20) as f:
+                f.writelines((record._sexp or record.finalize()) + b'\n' for record in records)
             logger.info(f"Exported {len(self.rules)} rules, {len(self.inferences)} inferences, and {len(self.perceptions)} perceptions to {filename}")
         except IOError as e:
             logger.error(f"Failed to export records: {str(e)}")
@@ -493,28 +799,18 @@ class PCSISystem:
         """Save article content to a readable text file."""
         try:
             os.makedirs(output_dir, exist_ok=True)
-            filename = f"{output_dir}/{article.date}_{article.headline[:30].replace(' ', '_')}.txt"
+            safe_headline = article.headline[:30].translate(self._FILENAME_SANITIZE)
+            filename = os.path.join(output_dir, f"{article.date}_{safe_headline}.txt")
             
             with open(filename, 'w', encoding='utf-8') as f:
                 f.write(f"Title: {article.headline}\n")
                 f.write(f"Author: {article.author}\n")
                 f.write(f"Date: {datetime.datetime.fromtimestamp(article.date).strftime('%Y-%m-%d %H:%M:%S')}\n\n")
                 
+                text_parts = []
                 for element in article.body.elements:
-                    if isinstance(element, Paragraph):
-                        paragraph_text = ""
-                        for item in element.content:
-                            if isinstance(item, str):
-                                paragraph_text += item
-                            elif isinstance(item, Link):
-                                paragraph_text += f"[LINK: {item.url}]"
-                        f.write(f"{paragraph_text}\n\n")
-                    elif isinstance(element, Subheading):
-                        f.write(f"\n## {element.text}\n\n")
-                    elif isinstance(element, Image):
-                        f.write(f"[IMAGE: {element.url}]\n")
-                        if element.caption:
-                            f.write(f"Caption: {element.caption}\n\n")
+                    element.to_text(text_parts)
+                f.writelines(text_parts)
             
             logger.info(f"Saved article content to {filename}")
             return filename
@@ -534,6 +830,8 @@ def main():
     parser.add_argument('--verbose', action='store_true', help='Print verbose output')
     parser.add_argument('--save-content', action='store_true', help='Save article content to text files')
     parser.add_argument('--output-dir', type=str, default='extracted_articles', help='Directory to save extracted articles')
+    parser.add_argument('--cache-dir', type=str, default=os.environ.get('PCSI_CACHE_DIR'),
+                        help='Cache fetched HTML in this directory and reuse it on reruns (development only; also PCSI_CACHE_DIR)')
     
     args = parser.parse_args()
     
@@ -541,9 +839,10 @@ def main():
     if args.verbose:
         logger.setLevel(logging.DEBUG)
         logger.debug("Verbose logging enabled")
+        _log_hash_backend()
     
     # Initialize the PCSI system
-    pcsi = PCSISystem()
+    pcsi = PCSISystem(cache_dir=args.cache_dir)
     
     # Updated URLs to more current BBC articles
     urls = args.urls if args.urls else [
@@ -558,17 +857,42 @@ def main():
     print("\n📰 PCSI BBC Article Extraction")
     print("==============================\n")
     
-    for i, url in enumerate(urls, 1):
+    # Fetching is network-bound, so overlap the requests on a thread pool and
+    # report on the results in input order afterwards. Each worker also hashes
+    # its article, so SHA-256 work is spread across threads as well
+    def fetch(numbered_url):
+        i, url = numbered_url
         print(f"[{i}/{len(urls)}] Processing {url}...")
-        content_object, inference = pcsi.process_url(url)
+        return pcsi.process_url(url, record=False)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=min(32, len(urls))) as executor:
+            results = list(executor.map(fetch, enumerate(urls, 1)))
+    finally:
+        pcsi.close()
+    
+    # Record inferences in input order so exports are reproducible
+    for _, inference in results:
+        if inference:
+            pcsi.record_inference(inference)
+    
+    # Perceptions for this batch share one timestamp
+    perception_time = _now() // 1_000_000_000
+    
+    for i, (url, (processed, inference)) in enumerate(zip(urls, results), 1):
+        print(f"\n[{i}/{len(urls)}] {url}")
         
-        if content_object:
+        if processed:
+            # The S-expression and hash were computed once in process_url;
+            # nothing below re-serializes the article
+            content_object = processed.article
+            object_hash = processed.object_hash
             successful += 1
             print(f"✅ Successfully extracted: {content_object.headline}")
             
             # Print the S-expression output in the requested format
             print("\n✅ PCSI S-expression output:\n")
-            print(content_object.to_sexp())
+            print(processed.sexp.decode('utf-8'))
             print("\n")
             
             # Save article content if requested
@@ -581,14 +905,15 @@ def main():
                 print(f"  - Author: {content_object.author}")
                 print(f"  - Date: {datetime.datetime.fromtimestamp(content_object.date).strftime('%Y-%m-%d %H:%M:%S')}")
                 print(f"  - Body elements: {len(content_object.body.elements)}")
-                print(f"  - Hash: {content_object.hash()}")
+                print(f"  - Hash: {object_hash}")
                 
             # Add a positive perception
             pcsi.add_perception(
                 url=url,
                 object_type=content_object.type,
-                object_hash=content_object.hash(),
-                valid=True
+                object_hash=object_hash,
+                valid=True,
+                timestamp=perception_time
             )
         else:
             failed += 1